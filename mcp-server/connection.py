@@ -6,55 +6,123 @@ Handles vCenter connections and session management
 
 import os
 import ssl
+import time
 import socket
+import atexit
+import logging
+import threading
+import urllib3
 import requests
-import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pyVim.connect import SmartConnect, Disconnect
-from pyVmomi import vim
+from pyVmomi import vim, vmodl
+
+logger = logging.getLogger(__name__)
+
+# The REST session skips certificate checks on purpose (self-signed vCenter
+# certificates); without this urllib3 emits a warning on every request
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Global service instance
 _service_instance = None
 
+# ServiceContent of the current connection as (service_instance, content);
+# fetching it is a round-trip, and it does not change for the life of a session
+_service_content = None
+
+# A successful liveness check of the service instance is trusted for this many
+# seconds, so back-to-back tool calls do not each pay a vCenter round-trip
+LIVENESS_CHECK_INTERVAL = 30.0
+_last_liveness_check = 0.0
+
+# Shared REST session, the vCenter session ID it is authenticated with and
+# the base URL it was created for
+_http_session = None
+_rest_session_id = None
+_rest_base_url = None
+
+# Tools run in worker threads, so connecting and logging in are serialized
+_connection_lock = threading.Lock()
+_session_lock = threading.Lock()
+
+# Last known name -> managed object map per object type, used by find_by_name
+_name_index = {}
+
+# One lock per object type, so threads that miss together share one rebuild
+_name_index_locks = {}
+
+# Environment variables that must all be set to reach vCenter, in the order
+# _get_credentials() returns them
+_CREDENTIAL_VARS = ('VCENTER_HOST', 'VCENTER_USER', 'VCENTER_PASSWORD')
+
+
+def _get_credentials():
+    """Read the vCenter host and credentials from the environment in one pass."""
+    env = os.environ
+    return env.get('VCENTER_HOST'), env.get('VCENTER_USER'), env.get('VCENTER_PASSWORD')
+
+
+def _has_credentials(credentials):
+    """Check that every vCenter setting is present, logging the first one missing."""
+    for name, value in zip(_CREDENTIAL_VARS, credentials):
+        if not value:
+            logger.warning("%s is not set", name)
+            return False
+    return True
+
 
 def connect_to_vcenter():
     """Connect to vCenter using pyvmomi for power operations."""
-    global _service_instance
+    global _service_instance, _last_liveness_check
     
-    if _service_instance:
-        try:
-            # Test if connection is still alive
-            content = _service_instance.RetrieveContent()
-            return True
-        except:
-            _service_instance = None
+    if _service_instance and time.monotonic() - _last_liveness_check < LIVENESS_CHECK_INTERVAL:
+        return True
     
-    try:
-        host = os.getenv('VCENTER_HOST')
-        user = os.getenv('VCENTER_USER')
-        password = os.getenv('VCENTER_PASSWORD')
-        
-        if not all([host, user, password]):
-            return False
-        
-        # Add timeout to prevent hanging
-        socket.setdefaulttimeout(3)  # 3 second timeout
+    with _connection_lock:
+        # Another thread (such as the startup warm-up) may have just connected
+        if _service_instance and time.monotonic() - _last_liveness_check < LIVENESS_CHECK_INTERVAL:
+            return True
         
-        # Create SSL context with optimizations
-        context = ssl.SSLContext(ssl.PROTOCOL_TLS)
-        context.verify_mode = ssl.CERT_NONE
-        context.check_hostname = False
+        if _service_instance:
+            try:
+                # Test if connection is still alive with the cheapest server call
+                _service_instance.CurrentTime()
+                _last_liveness_check = time.monotonic()
+                return True
+            except Exception:
+                _service_instance = None
         
-        _service_instance = SmartConnect(
-            host=host,
-            user=user,
-            pwd=password,
-            sslContext=context
-        )
-        return True
-        
-    except Exception as e:
-        print(f"Connection error: {e}", file=sys.stderr)
-        return False
+        try:
+            credentials = _get_credentials()
+            
+            if not _has_credentials(credentials):
+                return False
+            
+            host, user, password = credentials
+            
+            # Add timeout to prevent hanging
+            socket.setdefaulttimeout(3)  # 3 second timeout
+            
+            # Create SSL context with optimizations
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS)
+            context.verify_mode = ssl.CERT_NONE
+            context.check_hostname = False
+            
+            _service_instance = SmartConnect(
+                host=host,
+                user=user,
+                pwd=password,
+                sslContext=context
+            )
+            _last_liveness_check = time.monotonic()
+            # Cached objects are bound to the old session's stub
+            _name_index.clear()
+            return True
+            
+        except Exception as e:
+            logger.error("Connection error: %s", e)
+            return False
 
 
 def get_service_instance():
@@ -64,43 +132,298 @@ def get_service_instance():
     return None
 
 
-def get_vcenter_session():
-    """Get vCenter REST API session for fast operations."""
-    host = os.getenv('VCENTER_HOST')
-    user = os.getenv('VCENTER_USER')
-    password = os.getenv('VCENTER_PASSWORD')
+def get_content():
+    """Return the ServiceContent of the current connection, retrieving it once per connection."""
+    global _service_content
     
-    if not all([host, user, password]):
-        return None
+    service_instance = _service_instance
+    cached = _service_content
+    if cached and cached[0] is service_instance:
+        return cached[1]
+    
+    content = service_instance.RetrieveContent()
+    _service_content = (service_instance, content)
+    return content
+
+
+def wait_for_task(task):
+    """Wait for a vCenter task to finish and return its final state.
+    
+    Uses a dedicated PropertyCollector and WaitForUpdatesEx so vCenter reports
+    changes to the task state instead of the client polling task.info.
+    """
+    pc = vmodl.query.PropertyCollector
+    collector = get_content().propertyCollector.CreatePropertyCollector()
+    filter_spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=task)],
+        propSet=[pc.PropertySpec(type=vim.Task, pathSet=['info.state'])]
+    )
+    property_filter = collector.CreateFilter(filter_spec, True)
+    
+    # Keep each wait below the 3 second socket timeout set in connect_to_vcenter
+    options = pc.WaitOptions(maxWaitSeconds=2)
+    done_states = (vim.TaskInfo.State.success, vim.TaskInfo.State.error)
     
     try:
-        # Create session
-        session_url = f"https://{host}/rest/com/vmware/cis/session"
-        response = requests.post(
-            session_url,
-            auth=(user, password),
-            verify=False,
-            timeout=5
+        version = ''
+        state = None
+        while state not in done_states:
+            update = collector.WaitForUpdatesEx(version, options)
+            if not update:
+                continue
+            version = update.version
+            for filter_set in update.filterSet:
+                for object_set in filter_set.objectSet:
+                    for change in object_set.changeSet:
+                        if change.name == 'info.state':
+                            state = change.val
+        return state
+    finally:
+        property_filter.Destroy()
+        collector.Destroy()
+
+
+def retrieve_properties(obj_type, path_set):
+    """Fetch selected properties of every object of a type in one PropertyCollector call.
+    
+    Returns a list of dicts mapping each property path to its value, plus 'obj'
+    for the managed object itself. Properties vCenter leaves unset are absent,
+    so callers should use .get().
+    """
+    pc = vmodl.query.PropertyCollector
+    content = get_content()
+    view = content.viewManager.CreateContainerView(content.rootFolder, [obj_type], True)
+    
+    try:
+        traversal = pc.TraversalSpec(name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+        filter_spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=view, skip=True, selectSet=[traversal])],
+            propSet=[pc.PropertySpec(type=obj_type, pathSet=list(path_set))]
         )
+        collector = content.propertyCollector
         
-        if response.status_code == 200:
-            session_id = response.json()['value']
-            return session_id
-        else:
-            print(f"Failed to create session: {response.status_code}", file=sys.stderr)
-            return None
+        objects = []
+        result = collector.RetrievePropertiesEx([filter_spec], pc.RetrieveOptions())
+        while result:
+            for obj_content in result.objects:
+                props = {prop.name: prop.val for prop in obj_content.propSet}
+                props['obj'] = obj_content.obj
+                objects.append(props)
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(result.token)
+        return objects
+    finally:
+        view.Destroy()
+
+
+def get_properties(obj, path_set):
+    """Fetch several properties of one object in a single PropertyCollector call.
+    
+    Returns a dict mapping each property path to its value; unset properties
+    are absent.
+    """
+    pc = vmodl.query.PropertyCollector
+    filter_spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=obj, skip=False)],
+        propSet=[pc.PropertySpec(type=type(obj), pathSet=list(path_set))]
+    )
+    collector = get_content().propertyCollector
+    result = collector.RetrievePropertiesEx([filter_spec], pc.RetrieveOptions())
+    if not result or not result.objects:
+        return {}
+    return {prop.name: prop.val for prop in result.objects[0].propSet}
+
+
+def _read_if_named(obj, name, paths):
+    """Read paths of obj if it still exists under the given name, else return None."""
+    try:
+        props = get_properties(obj, paths)
+    except vmodl.fault.ManagedObjectNotFound:
+        return None
+    return props if props.get('name') == name else None
+
+
+def _rebuild_name_index(obj_type, stale):
+    """Rebuild the name -> object index of a type from a names-only property fetch.
+    
+    stale is the index the caller found wanting. If another thread replaced it
+    while this one waited for the lock, that fresh index is returned instead of
+    listing the inventory again.
+    """
+    with _name_index_locks.setdefault(obj_type, threading.Lock()):
+        index = _name_index.get(obj_type)
+        if index is not None and index is not stale:
+            return index
+        
+        index = {}
+        for props in retrieve_properties(obj_type, ['name']):
+            index.setdefault(props.get('name'), props['obj'])
+        _name_index[obj_type] = index
+        return index
+
+
+def find_with_properties(obj_type, name, path_set=()):
+    """Find an object by name and fetch extra properties in the same round-trip.
+    
+    Returns (obj, props), or (None, {}) if no object has that name. Names are
+    resolved from a cached index; a hit is confirmed by reading its name along
+    with the requested properties. A miss, rename or deleted object rebuilds
+    the index from names only, then reads the properties of the one object
+    found, so new and renamed objects are still found without fetching
+    path_set for the whole inventory.
+    """
+    paths = ['name', *path_set]
+    
+    index = _name_index.get(obj_type)
+    obj = index.get(name) if index else None
+    if obj is not None:
+        props = _read_if_named(obj, name, paths)
+        if props is not None:
+            return obj, props
+    
+    obj = _rebuild_name_index(obj_type, index).get(name)
+    if obj is None:
+        return None, {}
+    if not path_set:
+        # The index was just read, so the name needs no second check
+        return obj, {'name': name}
+    
+    props = _read_if_named(obj, name, paths)
+    if props is None:
+        return None, {}
+    return obj, props
+
+
+def find_by_name(obj_type, name):
+    """Return the first object of a type with the given name, or None if there is none."""
+    return find_with_properties(obj_type, name)[0]
+
+
+def _get_http_session():
+    """Get the shared requests session used for vCenter REST calls."""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        _http_session.verify = False
+        
+        # Keep enough pooled connections for concurrent tool calls and retry
+        # transient gateway errors from vCenter's reverse proxy
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+        )
+        _http_session.mount('https://', adapter)
+    return _http_session
+
+
+def get_vcenter_session(force_new=False):
+    """Get vCenter REST API session ID, logging in only if no session is cached."""
+    global _rest_session_id, _rest_base_url
+    
+    if _rest_session_id and not force_new:
+        return _rest_session_id
+    
+    credentials = _get_credentials()
+    
+    if not _has_credentials(credentials):
+        return None
+    
+    host, user, password = credentials
+    
+    with _session_lock:
+        # Another thread may have logged in while we waited for the lock
+        if _rest_session_id and not force_new:
+            return _rest_session_id
+        
+        session = _get_http_session()
+        session.headers.pop('vmware-api-session-id', None)
+        _rest_session_id = None
+        
+        try:
+            # Create session
+            base_url = f"https://{host}"
+            response = session.post(
+                f"{base_url}/rest/com/vmware/cis/session",
+                auth=(user, password),
+                timeout=5
+            )
             
-    except Exception as e:
-        print(f"Session error: {e}", file=sys.stderr)
+            if response.status_code == 200:
+                _rest_session_id = response.json()['value']
+                _rest_base_url = base_url
+                session.headers['vmware-api-session-id'] = _rest_session_id
+                return _rest_session_id
+            else:
+                logger.error("Failed to create session: HTTP %s", response.status_code)
+                return None
+                
+        except Exception as e:
+            logger.error("Session error: %s", e)
+            return None
+
+
+def rest_get(path, timeout=10):
+    """GET a vCenter REST endpoint on the shared session, re-authenticating once on 401."""
+    if not get_vcenter_session():
         return None
+    
+    url = f"{_rest_base_url}{path}"
+    session = _get_http_session()
+    response = session.get(url, timeout=timeout)
+    
+    # The cached session expired on the vCenter side - log in again and retry
+    if response.status_code == 401 and get_vcenter_session(force_new=True):
+        response = session.get(url, timeout=timeout)
+    
+    return response
+
+
+def logout_vcenter_session():
+    """Log out of the cached REST session so it does not hold a vCenter session slot."""
+    global _rest_session_id
+    if not _rest_session_id:
+        return
+    
+    try:
+        _http_session.delete(
+            f"{_rest_base_url}/rest/com/vmware/cis/session",
+            timeout=5
+        )
+    except Exception:
+        pass
+    _http_session.headers.pop('vmware-api-session-id', None)
+    _rest_session_id = None
+
+
+def warm_up():
+    """Connect and log in to vCenter in a background thread.
+    
+    Connections are otherwise made on first use, which puts the TLS handshake
+    and both logins on the first tool call. Tools that run while the warm-up
+    is in progress wait on the same locks instead of connecting again.
+    """
+    def _warm_up():
+        if _has_credentials(_get_credentials()):
+            connect_to_vcenter()
+            get_vcenter_session()
+    
+    thread = threading.Thread(target=_warm_up, name='vcenter-warm-up', daemon=True)
+    thread.start()
+    return thread
 
 
 def disconnect_vcenter():
     """Disconnect from vCenter."""
     global _service_instance
+    logout_vcenter_session()
     if _service_instance:
         try:
             Disconnect(_service_instance)
-        except:
+        except Exception:
             pass
-        _service_instance = None 
\ No newline at end of file
+        _service_instance = None
+
+
+atexit.register(disconnect_vcenter)
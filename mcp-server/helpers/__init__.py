@@ -9,7 +9,8 @@ from .power_parser import (
     parse_power_instructions_smart,
     parse_power_instructions_spacy,
     parse_power_instructions_manual,
-    categorize_vms_by_power
+    categorize_vms_by_power,
+    build_selector_matcher
 )
 
 from .vm_parser import (
@@ -34,6 +35,7 @@ __all__ = [
     'parse_power_instructions_spacy', 
     'parse_power_instructions_manual',
     'categorize_vms_by_power',
+    'build_selector_matcher',
     
     # VM parser functions
     'categorize_vms_by_type',
@@ -5,11 +5,11 @@ Handles parsing of VM power sequences from maintenance instructions
 """
 
 import re
+import copy
+import functools
 from typing import Dict, Any, List, Optional
 from collections import defaultdict
 
-import spacy
-
 # Constants for power sequence parsing
 POWER_ACTIONS = {
     "shutdown": [
@@ -62,6 +62,28 @@ SELECTOR_PATTERNS = [
     r'(\w+(?:\s+\w+)*)\s+in\s+their\s+names?',  # "worker in their names"
 ]
 
+# The tables above compiled once at import; the parser runs every pattern
+# over every line, so this skips re's pattern cache lookup on each search
+_POWER_ACTION_RES = {
+    action: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    for action, patterns in POWER_ACTIONS.items()
+}
+_SEQUENCE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in SEQUENCE_PATTERNS]
+_CATEGORY_RES = {
+    category: [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in patterns]
+    for category, patterns in CATEGORY_PATTERNS.items()
+}
+_SELECTOR_RES = [re.compile(pattern, re.IGNORECASE) for pattern in SELECTOR_PATTERNS]
+# Ordinal words that introduce a wave in free-form text, in wave order
+_NATURAL_WAVE_RES = [
+    re.compile(rf"{indicator}[,\s]+([^,.]+)", re.IGNORECASE)
+    for indicator in ("first", "second", "third", "then", "next", "finally")
+]
+# Numbered wave headings recognized in spaCy sentences (the first three SEQUENCE_PATTERNS)
+_SPACY_WAVE_RES = _SEQUENCE_RES[:3]
+_SENTENCE_END_RE = re.compile(r'[.!?]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 def parse_power_instructions(instructions_text: str) -> Dict[str, Any]:
     """
     Parse maintenance instructions for power sequences.
@@ -89,7 +111,15 @@ def parse_power_instructions(instructions_text: str) -> Dict[str, Any]:
     return parse_power_instructions_manual(instructions_text)
 
 def parse_power_instructions_smart(instructions_text: str) -> Dict[str, Any]:
-    """Parse power instructions using smart pattern matching."""
+    """Parse power instructions using smart pattern matching.
+    
+    Results are memoized per instructions text; each caller gets its own copy.
+    """
+    return copy.deepcopy(_parse_power_instructions_smart_cached(instructions_text))
+
+@functools.lru_cache(maxsize=128)
+def _parse_power_instructions_smart_cached(instructions_text: str) -> Dict[str, Any]:
+    """Parse power instructions using smart pattern matching, caching the result."""
     try:
         text = instructions_text.lower().strip()
         sections = _extract_power_sections(text)
@@ -113,15 +143,34 @@ def parse_power_instructions_smart(instructions_text: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Smart power parsing failed: {str(e)}"}
 
+@functools.lru_cache(maxsize=1)
+def _load_spacy_model():
+    """Load the spaCy English pipeline once, returning (nlp, error).
+    
+    Both outcomes are cached, so a missing spaCy install or model is detected
+    on the first call instead of re-attempting the import and load every time.
+    """
+    try:
+        # spaCy is only needed for this fallback, so defer its (slow) import
+        import spacy
+        return spacy.load("en_core_web_sm"), None
+    except ImportError:
+        return None, "spaCy is not installed. Install with: pip install spacy"
+    except OSError:
+        return None, "spaCy English model not found. Install with: python -m spacy download en_core_web_sm"
+
 def parse_power_instructions_spacy(instructions_text: str) -> Dict[str, Any]:
     """Parse power instructions using spaCy NLP."""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        nlp, error = _load_spacy_model()
+        if error:
+            return {"error": error}
+        
         doc = nlp(instructions_text.lower().strip())
         
         sections = _extract_power_sections_spacy(doc)
-        power_down_sequence = _parse_power_sequence_spacy(sections.get("shutdown", ""), "shutdown")
-        power_up_sequence = _parse_power_sequence_spacy(sections.get("startup", ""), "startup")
+        power_down_sequence = _parse_power_sequence_spacy(nlp, sections.get("shutdown", ""), "shutdown")
+        power_up_sequence = _parse_power_sequence_spacy(nlp, sections.get("startup", ""), "startup")
         
         if not power_down_sequence and not power_up_sequence:
             return {"error": "No power sequences found in instructions"}
@@ -136,8 +185,6 @@ def parse_power_instructions_spacy(instructions_text: str) -> Dict[str, Any]:
             "parser_type": "spacy"
         }
         
-    except OSError:
-        return {"error": "spaCy English model not found. Install with: python -m spacy download en_core_web_sm"}
     except Exception as e:
         return {"error": f"spaCy power parsing failed: {str(e)}"}
 
@@ -205,34 +252,53 @@ def categorize_vms_by_power(vm_names: List[str], parsed_instructions: Dict[str,
                     categorized_vms[category].append(vm_name)
                     used_vms.add(vm_name)
         else:
+            matches = build_selector_matcher(selectors)
             for vm_name in vm_names:
                 if vm_name in used_vms:
                     continue
                 
-                if _vm_matches_power_selectors(vm_name, selectors):
+                if matches(vm_name):
                     categorized_vms[category].append(vm_name)
                     used_vms.add(vm_name)
     
     return categorized_vms
 
-def _vm_matches_power_selectors(vm_name: str, selectors: List[str]) -> bool:
-    """Check if a VM name matches power sequence selectors."""
-    vm_lower = vm_name.lower()
+def build_selector_matcher(selectors: List[str], match_singular_name: bool = True):
+    """
+    Build a test for VM names against one category's selectors.
+    
+    A name matches when a selector (or its singular form) occurs in it, or when
+    the name occurs in a selector. With match_singular_name, the name without a
+    trailing 's' may also occur in a selector. The selector forms are compiled
+    into one regex, so each VM is checked with a single search.
     
+    Args:
+        selectors: Selectors of one category
+        match_singular_name: Also try the VM name without a trailing 's'
+        
+    Returns:
+        Function taking a VM name and returning whether it matches
+    """
+    forms = set()
     for selector in selectors:
         selector_lower = selector.lower()
-        selector_singular = selector_lower[:-1] if selector_lower.endswith('s') else selector_lower
-        vm_singular = vm_lower[:-1] if vm_lower.endswith('s') else vm_lower
-        
-        if (selector_lower in vm_lower or 
-            selector_singular in vm_lower or
-            vm_lower in selector_lower or 
-            vm_lower in selector_singular or
-            vm_singular in selector_lower or
-            vm_singular in selector_singular):
+        forms.add(selector_lower)
+        forms.add(selector_lower[:-1] if selector_lower.endswith('s') else selector_lower)
+    
+    if not forms:
+        return lambda vm_name: False
+    
+    pattern = re.compile("|".join(re.escape(form) for form in sorted(forms)))
+    # VM names never span lines, so a newline-joined string tests "occurs in any selector"
+    joined = "\n".join(forms)
+    
+    def matches(vm_name: str) -> bool:
+        vm_lower = vm_name.lower()
+        if pattern.search(vm_lower) or vm_lower in joined:
             return True
+        return match_singular_name and vm_lower.endswith('s') and vm_lower[:-1] in joined
     
-    return False
+    return matches
 
 def _extract_power_sections(text: str) -> Dict[str, str]:
     """Extract shutdown and startup sections."""
@@ -243,9 +309,9 @@ def _extract_power_sections(text: str) -> Dict[str, str]:
     for line in lines:
         line_lower = line.lower()
         
-        if any(re.search(pattern, line_lower) for pattern in POWER_ACTIONS["shutdown"]):
+        if _POWER_ACTION_RES["shutdown"].search(line_lower):
             current_section = "shutdown"
-        elif any(re.search(pattern, line_lower) for pattern in POWER_ACTIONS["startup"]):
+        elif _POWER_ACTION_RES["startup"].search(line_lower):
             current_section = "startup"
         elif line_lower.startswith('##') and current_section:
             current_section = None
@@ -263,9 +329,8 @@ def _parse_power_sequence(section_text: str, sequence_type: str) -> List[Dict[st
     waves = []
     wave_order = 1
     
-    for pattern in SEQUENCE_PATTERNS:
-        matches = re.finditer(pattern, section_text, re.IGNORECASE)
-        for match in matches:
+    for pattern in _SEQUENCE_RES:
+        for match in pattern.finditer(section_text):
             if len(match.groups()) >= 2:
                 description = match.group(2).strip()
             else:
@@ -293,8 +358,8 @@ def _categorize_power_description(description: str) -> str:
     """Categorize a power sequence description."""
     desc_lower = description.lower()
     
-    for category, patterns in CATEGORY_PATTERNS.items():
-        if any(re.search(pattern, desc_lower, re.IGNORECASE) for pattern in patterns):
+    for category, patterns in _CATEGORY_RES.items():
+        if any(compiled.search(desc_lower) for _, compiled in patterns):
             return category
     
     if any(word in desc_lower for word in ["worker", "node"]):
@@ -313,7 +378,7 @@ def _categorize_power_description(description: str) -> str:
 def _extract_power_selectors_from_context(text: str, position: int) -> List[str]:
     """Extract power selectors from context."""
     selectors = []
-    sentences = re.split(r'[.!?]', text)
+    sentences = _SENTENCE_END_RE.split(text)
     current_pos = 0
     
     for sentence in sentences:
@@ -329,22 +394,21 @@ def _extract_power_selectors_from_text(text: str) -> List[str]:
     """Extract power selectors from text."""
     selectors = []
     
-    for pattern in SELECTOR_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
+    for pattern in _SELECTOR_RES:
+        for match in pattern.findall(text):
             if isinstance(match, tuple):
                 selectors.extend(match)
             else:
                 selectors.append(match)
     
-    for category, patterns in CATEGORY_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+    for patterns in _CATEGORY_RES.values():
+        for pattern, compiled in patterns:
+            if compiled.search(text):
                 selectors.append(pattern.replace(r'\s+', ' '))
     
     clean_selectors = []
     for selector in selectors:
-        clean_selector = re.sub(r'\s+', ' ', selector.strip()).lower()
+        clean_selector = _WHITESPACE_RE.sub(' ', selector.strip()).lower()
         if clean_selector and clean_selector not in clean_selectors:
             clean_selectors.append(clean_selector)
     
@@ -355,18 +419,8 @@ def _infer_power_waves_from_natural_language(text: str, sequence_type: str) -> L
     waves = []
     wave_order = 1
     
-    natural_patterns = [
-        (r"first[,\s]+([^,.]+)", "first"),
-        (r"second[,\s]+([^,.]+)", "second"),
-        (r"third[,\s]+([^,.]+)", "third"),
-        (r"then[,\s]+([^,.]+)", "then"),
-        (r"next[,\s]+([^,.]+)", "next"),
-        (r"finally[,\s]+([^,.]+)", "finally"),
-    ]
-    
-    for pattern, indicator in natural_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
+    for pattern in _NATURAL_WAVE_RES:
+        for match in pattern.finditer(text):
             description = match.group(1).strip()
             category = _categorize_power_description(description)
             selectors = _extract_power_selectors_from_context(text, match.start())
@@ -419,12 +473,11 @@ def _extract_power_sections_spacy(doc) -> Dict[str, str]:
     
     return sections
 
-def _parse_power_sequence_spacy(section_text: str, sequence_type: str) -> List[Dict[str, Any]]:
-    """Parse power sequence using spaCy."""
+def _parse_power_sequence_spacy(nlp, section_text: str, sequence_type: str) -> List[Dict[str, Any]]:
+    """Parse power sequence using an already loaded spaCy pipeline."""
     if not section_text.strip():
         return []
     
-    nlp = spacy.load("en_core_web_sm")
     doc = nlp(section_text)
     
     waves = []
@@ -460,14 +513,8 @@ def _parse_power_sequence_spacy(section_text: str, sequence_type: str) -> List[D
 
 def _extract_power_wave_info_spacy(text: str) -> Optional[Dict[str, Any]]:
     """Extract power wave information using spaCy patterns."""
-    patterns = [
-        r'(\d+)\.?\s*\*\*([^*]+)\*\*',  # 1. **Wave 1 - Worker Nodes**
-        r'wave\s*(\d+)[:\-]?\s*([^,\n]+)',  # Wave 1: Worker Nodes
-        r'(\d+)\.?\s*([^,\n]+?)(?:nodes?|plane|vms?|applications?)',  # 1. Worker Nodes
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _SPACY_WAVE_RES:
+        match = pattern.search(text)
         if match:
             description = match.group(2).strip()
             category = _categorize_power_description(description)
@@ -5,7 +5,7 @@ Handles VM-specific parsing tasks like categorization and matching
 """
 
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from collections import defaultdict
 
 def categorize_vms_by_type(vm_names: List[str], vm_types: Dict[str, List[str]]) -> Dict[str, Any]:
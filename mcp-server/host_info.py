@@ -7,6 +7,16 @@ Handles detailed information about physical hosts/rack servers
 from pyVmomi import vim
 import connection
 
+# Readable names for the performance counter IDs queried below
+HOST_COUNTER_NAMES = {
+    1: "CPU Usage",
+    4: "Memory Usage (MB)",
+    110: "Disk Read (KB/s)",
+    111: "Disk Write (KB/s)",
+    104: "Network Received (KB/s)",
+    105: "Network Transmitted (KB/s)"
+}
+
 
 def list_hosts() -> str:
     """List all physical hosts with basic information."""
@@ -15,18 +25,18 @@ def list_hosts() -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
+        host_props = connection.retrieve_properties(
+            vim.HostSystem,
+            ['name', 'runtime.connectionState', 'runtime.powerState', 'runtime.inMaintenanceMode']
         )
         
         hosts = []
-        for host in container.view:
+        for host in host_props:
             hosts.append({
-                'name': host.name,
-                'connection_state': host.runtime.connectionState,
-                'power_state': host.runtime.powerState,
-                'maintenance_mode': host.runtime.inMaintenanceMode
+                'name': host['name'],
+                'connection_state': host.get('runtime.connectionState'),
+                'power_state': host.get('runtime.powerState'),
+                'maintenance_mode': host.get('runtime.inMaintenanceMode')
             })
         
         if hosts:
@@ -51,16 +61,7 @@ def get_host_details(host_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
-        )
-        
-        host = None
-        for h in container.view:
-            if h.name == host_name:
-                host = h
-                break
+        host = connection.find_by_name(vim.HostSystem, host_name)
         
         if not host:
             return f"Host '{host_name}' not found"
@@ -195,16 +196,8 @@ def get_host_performance_metrics(host_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
-        )
-        
-        host = None
-        for h in container.view:
-            if h.name == host_name:
-                host = h
-                break
+        content = connection.get_content()
+        host = connection.find_by_name(vim.HostSystem, host_name)
         
         if not host:
             return f"Host '{host_name}' not found"
@@ -245,17 +238,7 @@ def get_host_performance_metrics(host_name: str) -> str:
             instance = sample.id.instance
             value = sample.value[0] if sample.value else 0
             
-            # Map counter IDs to readable names
-            counter_names = {
-                1: "CPU Usage",
-                4: "Memory Usage (MB)",
-                110: "Disk Read (KB/s)",
-                111: "Disk Write (KB/s)",
-                104: "Network Received (KB/s)",
-                105: "Network Transmitted (KB/s)"
-            }
-            
-            metric_name = counter_names.get(counter_id, f"Counter {counter_id}")
+            metric_name = HOST_COUNTER_NAMES.get(counter_id, f"Counter {counter_id}")
             
             # Separate CPU metrics for better formatting
             if counter_id == 1:  # CPU
@@ -308,16 +291,7 @@ def get_host_hardware_health(host_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
-        )
-        
-        host = None
-        for h in container.view:
-            if h.name == host_name:
-                host = h
-                break
+        host = connection.find_by_name(vim.HostSystem, host_name)
         
         if not host:
             return f"Host '{host_name}' not found"
@@ -5,16 +5,30 @@ Handles reading maintenance instructions and executing VM power sequences
 """
 
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 import vm_info
 import power
+from helpers import build_selector_matcher
+
+# Upper bound on power operations running at once within a single wave
+MAX_PARALLEL_POWER_OPS = 8
+
+# Location of the maintenance instructions, resolved once at import
+INSTRUCTIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instructions', 'maintenance-vmware.md')
+
+@functools.lru_cache(maxsize=8)
+def _read_instructions_file(path: str, mtime_ns: int, size: int) -> str:
+    """Read an instructions file; mtime and size are part of the key so edits are picked up."""
+    with open(path, 'r') as f:
+        return f.read()
 
 def read_maintenance_instructions() -> str:
     """Read the maintenance-vmware.md file and return its contents."""
     try:
-        instructions_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instructions', 'maintenance-vmware.md')
-        with open(instructions_path, 'r') as f:
-            return f.read()
+        stat = os.stat(INSTRUCTIONS_PATH)
+        return _read_instructions_file(INSTRUCTIONS_PATH, stat.st_mtime_ns, stat.st_size)
     except FileNotFoundError:
         return "Error: maintenance-vmware.md file not found in instructions directory"
     except Exception as e:
@@ -113,18 +127,14 @@ def find_vms_by_category() -> Dict[str, Any]:
                         categorized_vms[category].append(vm_name)
                         used_vms.add(vm_name)
             else:
+                # This categorization has never matched on the singular VM name
+                matches = build_selector_matcher(selectors, match_singular_name=False)
                 for vm_name in vm_names:
                     if vm_name in used_vms:
                         continue
-                    vm_lower = vm_name.lower()
-                    for selector in selectors:
-                        selector_lower = selector.lower()
-                        selector_singular = selector_lower[:-1] if selector_lower.endswith('s') else selector_lower
-                        if (selector_lower in vm_lower or selector_singular in vm_lower or 
-                            vm_lower in selector_lower or vm_lower in selector_singular):
-                            categorized_vms[category].append(vm_name)
-                            used_vms.add(vm_name)
-                            break
+                    if matches(vm_name):
+                        categorized_vms[category].append(vm_name)
+                        used_vms.add(vm_name)
         
         return {
             'categories': categorized_vms,
@@ -150,9 +160,10 @@ def _execute_sequence(sequence_name: str, power_func) -> str:
                     vms = vm_data['categories'][category]
                     if vms:
                         results.append(f"\n{line}:")
-                        for vm_name in vms:
-                            result = power_func(vm_name)
-                            results.append(f"   - {vm_name}: {result}")
+                        # VMs within a wave are independent; the next wave starts only once all finish
+                        with ThreadPoolExecutor(max_workers=min(len(vms), MAX_PARALLEL_POWER_OPS)) as executor:
+                            for vm_name, result in zip(vms, executor.map(power_func, vms)):
+                                results.append(f"   - {vm_name}: {result}")
                     else:
                         results.append(f"\n{line}: No VMs found in this category")
         
@@ -7,6 +7,16 @@ Handles VM and host metrics collection using pyVmomi
 from pyVmomi import vim
 import connection
 
+# Readable names for the performance counter IDs queried below
+COUNTER_NAMES = {
+    6: "CPU Usage",
+    24: "Memory Usage (MB)",
+    110: "Disk Read (KB/s)",
+    111: "Disk Write (KB/s)",
+    104: "Network Received (KB/s)",
+    105: "Network Transmitted (KB/s)"
+}
+
 
 def get_vm_performance(vm_name: str) -> str:
     """Get detailed performance metrics for a specific VM."""
@@ -15,16 +25,8 @@ def get_vm_performance(vm_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-        
-        vm = None
-        for v in container.view:
-            if v.name == vm_name:
-                vm = v
-                break
+        content = connection.get_content()
+        vm = connection.find_by_name(vim.VirtualMachine, vm_name)
         
         if not vm:
             return f"VM '{vm_name}' not found"
@@ -65,17 +67,7 @@ def get_vm_performance(vm_name: str) -> str:
             instance = sample.id.instance
             value = sample.value[0] if sample.value else 0
             
-            # Map counter IDs to readable names
-            counter_names = {
-                6: "CPU Usage",
-                24: "Memory Usage (MB)",
-                110: "Disk Read (KB/s)",
-                111: "Disk Write (KB/s)",
-                104: "Network Received (KB/s)",
-                105: "Network Transmitted (KB/s)"
-            }
-            
-            metric_name = counter_names.get(counter_id, f"Counter {counter_id}")
+            metric_name = COUNTER_NAMES.get(counter_id, f"Counter {counter_id}")
             
             # Separate CPU metrics for better formatting
             if counter_id == 6:  # CPU
@@ -150,16 +142,8 @@ def get_host_performance(host_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
-        )
-        
-        host = None
-        for h in container.view:
-            if h.name == host_name:
-                host = h
-                break
+        content = connection.get_content()
+        host = connection.find_by_name(vim.HostSystem, host_name)
         
         if not host:
             return f"Host '{host_name}' not found"
@@ -200,17 +184,7 @@ def get_host_performance(host_name: str) -> str:
             instance = sample.id.instance
             value = sample.value[0] if sample.value else 0
             
-            # Map counter IDs to readable names
-            counter_names = {
-                6: "CPU Usage",
-                24: "Memory Usage (MB)",
-                110: "Disk Read (KB/s)",
-                111: "Disk Write (KB/s)",
-                104: "Network Received (KB/s)",
-                105: "Network Transmitted (KB/s)"
-            }
-            
-            metric_name = counter_names.get(counter_id, f"Counter {counter_id}")
+            metric_name = COUNTER_NAMES.get(counter_id, f"Counter {counter_id}")
             
             # Separate CPU metrics for better formatting
             if counter_id == 6:  # CPU
@@ -283,7 +257,7 @@ def list_performance_counters() -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
+        content = connection.get_content()
         perf_manager = content.perfManager
         
         # Get available counters
@@ -318,42 +292,30 @@ def list_performance_counters() -> str:
 
 
 def get_vm_summary_stats() -> str:
-    """Get summary statistics for all VMs."""
+    """Get summary statistics for all VMs, including templates.
+    
+    Reads power state, CPU count and memory for every VM in one paged property
+    fetch, so no per-VM calls are made and large inventories are not capped.
+    """
     service_instance = connection.get_service_instance()
     if not service_instance:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
+        vms = connection.retrieve_properties(
+            vim.VirtualMachine,
+            ['runtime.powerState', 'config.hardware.numCPU', 'config.hardware.memoryMB']
         )
         
-        total_vms = 0
-        powered_on = 0
-        powered_off = 0
-        suspended = 0
-        total_cpu = 0
-        total_memory = 0
-        
-        for vm in container.view:
-            total_vms += 1
-            
-            # Count power states
-            if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOn:
-                powered_on += 1
-            elif vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOff:
-                powered_off += 1
-            elif vm.runtime.powerState == vim.VirtualMachinePowerState.suspended:
-                suspended += 1
-            
-            # Sum resources
-            if vm.config and vm.config.hardware:
-                total_cpu += vm.config.hardware.numCPU
-                total_memory += vm.config.hardware.memoryMB
+        power_states = [vm.get('runtime.powerState') for vm in vms]
+        powered_on = power_states.count(vim.VirtualMachinePowerState.poweredOn)
+        powered_off = power_states.count(vim.VirtualMachinePowerState.poweredOff)
+        suspended = power_states.count(vim.VirtualMachinePowerState.suspended)
+        total_cpu = sum(vm.get('config.hardware.numCPU') or 0 for vm in vms)
+        total_memory = sum(vm.get('config.hardware.memoryMB') or 0 for vm in vms)
         
         result_text = "VM Summary Statistics:\n\n"
-        result_text += f"Total VMs: {total_vms}\n"
+        result_text += f"Total VMs: {len(vms)}\n"
         result_text += f"Powered On: {powered_on}\n"
         result_text += f"Powered Off: {powered_off}\n"
         result_text += f"Suspended: {suspended}\n"
@@ -373,16 +335,8 @@ def debug_vm_performance_raw(vm_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-        
-        vm = None
-        for v in container.view:
-            if v.name == vm_name:
-                vm = v
-                break
+        content = connection.get_content()
+        vm = connection.find_by_name(vim.VirtualMachine, vm_name)
         
         if not vm:
             return f"VM '{vm_name}' not found"
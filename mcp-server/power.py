@@ -4,80 +4,45 @@ Power Management Module for VMware MCP Server
 Handles VM power operations (power on, power off)
 """
 
-import sys
 from pyVmomi import vim
 import connection
+import vm_info
 
 
-def power_on_vm(vm_name: str) -> str:
-    """Power on a VM by name."""
+def _change_power_state(vm_name, target_state, method, action, done):
+    """Call a power method on a VM unless it is already in target_state."""
     service_instance = connection.get_service_instance()
     if not service_instance:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-        
-        vm = None
-        for v in container.view:
-            if v.name == vm_name:
-                vm = v
-                break
+        # Resolve the VM and read its power state in one round-trip
+        vm, props = connection.find_with_properties(vim.VirtualMachine, vm_name, ['runtime.powerState'])
         
         if not vm:
             return f"VM '{vm_name}' not found"
         
-        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOn:
-            return f"VM '{vm_name}' is already powered on"
+        if props.get('runtime.powerState') == target_state:
+            return f"VM '{vm_name}' is already {done}"
         
-        task = vm.PowerOn()
-        while task.info.state not in [vim.TaskInfo.State.success, vim.TaskInfo.State.error]:
-            pass
+        task = getattr(vm, method)()
+        state = connection.wait_for_task(task)
         
-        if task.info.state == vim.TaskInfo.State.success:
-            return f"✅ Successfully powered on VM '{vm_name}'"
+        if state == vim.TaskInfo.State.success:
+            vm_info.invalidate_vm_list_cache()
+            return f"✅ Successfully {done} VM '{vm_name}'"
         else:
-            return f"❌ Failed to power on VM '{vm_name}': {task.info.error.msg}"
+            return f"❌ Failed to {action} VM '{vm_name}': {task.info.error.msg}"
             
     except Exception as e:
         return f"Error: {e}"
 
 
+def power_on_vm(vm_name: str) -> str:
+    """Power on a VM by name."""
+    return _change_power_state(vm_name, vim.VirtualMachinePowerState.poweredOn, 'PowerOn', 'power on', 'powered on')
+
+
 def power_off_vm(vm_name: str) -> str:
     """Power off a VM by name."""
-    service_instance = connection.get_service_instance()
-    if not service_instance:
-        return "Error: Could not connect to vCenter"
-    
-    try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-        
-        vm = None
-        for v in container.view:
-            if v.name == vm_name:
-                vm = v
-                break
-        
-        if not vm:
-            return f"VM '{vm_name}' not found"
-        
-        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOff:
-            return f"VM '{vm_name}' is already powered off"
-        
-        task = vm.PowerOff()
-        while task.info.state not in [vim.TaskInfo.State.success, vim.TaskInfo.State.error]:
-            pass
-        
-        if task.info.state == vim.TaskInfo.State.success:
-            return f"✅ Successfully powered off VM '{vm_name}'"
-        else:
-            return f"❌ Failed to power off VM '{vm_name}': {task.info.error.msg}"
-            
-    except Exception as e:
-        return f"Error: {e}" 
\ No newline at end of file
+    return _change_power_state(vm_name, vim.VirtualMachinePowerState.poweredOff, 'PowerOff', 'power off', 'powered off')
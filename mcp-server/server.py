@@ -4,6 +4,14 @@ VMware MCP Server - Main Entry Point
 Clean, modular FastMCP server for VMware vCenter management
 """
 
+import os
+import sys
+import queue
+import atexit
+import logging
+import functools
+from logging.handlers import QueueHandler, QueueListener
+from anyio import CapacityLimiter, to_thread
 from fastmcp import FastMCP
 import vm_info
 import power
@@ -11,55 +19,98 @@ import vm_creation
 import monitoring
 import host_info
 import maintenance
+import connection
 
 # Create the MCP server instance
 mcp = FastMCP(name="VMware MCP Server")
+logger = logging.getLogger("server")
+
+# Caps how many tool calls can be talking to vCenter at the same time
+MAX_CONCURRENT_TOOL_CALLS = 8
+_tool_limiter = CapacityLimiter(MAX_CONCURRENT_TOOL_CALLS)
+
+# Accepted MCP_LOG_LEVEL values; anything else falls back to INFO
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL
+}
+
+
+def setup_logging():
+    """Configure logging to stderr through a queue so callers never block on the write."""
+    # Log to stderr so STDIO mode keeps stdout clean for the MCP protocol
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    # A background thread drains the queue, so tool threads and the event loop only enqueue
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logging.basicConfig(
+        level=_LEVELS.get((os.getenv('MCP_LOG_LEVEL') or 'INFO').upper(), logging.INFO),
+        handlers=[QueueHandler(log_queue)]
+    )
+    
+    # Per-connection chatter from the HTTP stack is never useful in server logs
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking vCenter call in a worker thread, bounded by the tool limiter."""
+    return await to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_tool_limiter)
+
 
 # VM Information Tools
 @mcp.tool()
-def list_vms() -> str:
-    """List all VMs using fast REST API."""
-    return vm_info.list_vms()
+async def list_vms() -> str:
+    """List all VMs with their power state using a single REST call (use get_vm_details for per-VM detail)."""
+    return await run_blocking(vm_info.list_vms)
 
 @mcp.tool()
-def get_vm_details(vm_name: str) -> str:
-    """Get detailed VM information including IP addresses and network info."""
-    return vm_info.get_vm_details(vm_name)
+async def get_vm_details(vm_name: str) -> str:
+    """Get detailed VM information including IP addresses and network info (slower than list_vms)."""
+    return await run_blocking(vm_info.get_vm_details, vm_name)
 
 @mcp.tool()
-def list_templates() -> str:
+async def list_templates() -> str:
     """List all available templates."""
-    return vm_info.list_templates()
+    return await run_blocking(vm_info.list_templates)
 
 @mcp.tool()
-def list_datastores() -> str:
+async def list_datastores() -> str:
     """List all available datastores."""
-    return vm_info.list_datastores()
+    return await run_blocking(vm_info.list_datastores)
 
 @mcp.tool()
-def list_networks() -> str:
+async def list_networks() -> str:
     """List all available networks."""
-    return vm_info.list_networks()
+    return await run_blocking(vm_info.list_networks)
 
 # Power Management Tools
 @mcp.tool()
-def power_on_vm(vm_name: str) -> str:
+async def power_on_vm(vm_name: str) -> str:
     """Power on a VM by name."""
-    return power.power_on_vm(vm_name)
+    return await run_blocking(power.power_on_vm, vm_name)
 
 @mcp.tool()
-def power_off_vm(vm_name: str) -> str:
+async def power_off_vm(vm_name: str) -> str:
     """Power off a VM by name."""
-    return power.power_off_vm(vm_name)
+    return await run_blocking(power.power_off_vm, vm_name)
 
 # VM Creation Tools
 @mcp.tool()
-def create_vm_custom(template_name: str, new_vm_name: str, ip_address: str = "192.168.1.100", 
-                    netmask: str = "255.255.255.0", gateway: str = "192.168.1.1", 
-                    memory_gb: int = 4, cpu_count: int = 2, disk_gb: int = 50, 
-                    network_name: str = "VM Network", datastore_name: str = "datastore1") -> str:
+async def create_vm_custom(template_name: str, new_vm_name: str, ip_address: str = "192.168.1.100", 
+                          netmask: str = "255.255.255.0", gateway: str = "192.168.1.1", 
+                          memory_gb: int = 4, cpu_count: int = 2, disk_gb: int = 50, 
+                          network_name: str = "VM Network", datastore_name: str = "datastore1") -> str:
     """Create a new VM from template with comprehensive customization (memory, CPU, disk, IP) - powered off by default."""
-    return vm_creation.create_vm_custom(
+    return await run_blocking(
+        vm_creation.create_vm_custom,
         template_name=template_name,
         new_vm_name=new_vm_name,
         ip_address=ip_address,
@@ -74,71 +125,74 @@ def create_vm_custom(template_name: str, new_vm_name: str, ip_address: str = "19
 
 # Host Information Tools
 @mcp.tool()
-def list_hosts() -> str:
+async def list_hosts() -> str:
     """List all physical hosts with basic information."""
-    return host_info.list_hosts()
+    return await run_blocking(host_info.list_hosts)
 
 @mcp.tool()
-def get_host_details(host_name: str) -> str:
+async def get_host_details(host_name: str) -> str:
     """Get detailed information about a specific physical host (hardware, network, storage, VMs)."""
-    return host_info.get_host_details(host_name)
+    return await run_blocking(host_info.get_host_details, host_name)
 
 @mcp.tool()
-def get_host_performance_metrics(host_name: str) -> str:
+async def get_host_performance_metrics(host_name: str) -> str:
     """Get detailed performance metrics for a specific host (CPU, memory, disk, network)."""
-    return host_info.get_host_performance_metrics(host_name)
+    return await run_blocking(host_info.get_host_performance_metrics, host_name)
 
 @mcp.tool()
-def get_host_hardware_health(host_name: str) -> str:
+async def get_host_hardware_health(host_name: str) -> str:
     """Get hardware health information for a specific host (sensors, system health)."""
-    return host_info.get_host_hardware_health(host_name)
+    return await run_blocking(host_info.get_host_hardware_health, host_name)
 
 # Monitoring Tools
 @mcp.tool()
-def get_vm_performance(vm_name: str) -> str:
+async def get_vm_performance(vm_name: str) -> str:
     """Get detailed performance metrics for a specific VM (CPU, memory, disk, network)."""
-    return monitoring.get_vm_performance(vm_name)
+    return await run_blocking(monitoring.get_vm_performance, vm_name)
 
 @mcp.tool()
-def get_host_performance(host_name: str = "") -> str:
+async def get_host_performance(host_name: str = "") -> str:
     """Get performance metrics for hosts (hardware info, health status)."""
     if not host_name:
         return "Error: Host name is required"
-    return monitoring.get_host_performance(host_name)
+    return await run_blocking(monitoring.get_host_performance, host_name)
 
 @mcp.tool()
-def list_performance_counters() -> str:
+async def list_performance_counters() -> str:
     """List all available performance counters in vCenter."""
-    return monitoring.list_performance_counters()
+    return await run_blocking(monitoring.list_performance_counters)
 
 @mcp.tool()
-def get_vm_summary_stats() -> str:
+async def get_vm_summary_stats() -> str:
     """Get summary statistics for all VMs (counts, resource totals)."""
-    return monitoring.get_vm_summary_stats()
+    return await run_blocking(monitoring.get_vm_summary_stats)
 
 # Maintenance Tools
 @mcp.tool()
-def get_maintenance_instructions() -> str:
+async def get_maintenance_instructions() -> str:
     """Get the maintenance instructions from the maintenance-vmware.md file."""
-    return maintenance.read_maintenance_instructions()
+    return await run_blocking(maintenance.read_maintenance_instructions)
 
 @mcp.tool()
-def get_maintenance_plan() -> str:
+async def get_maintenance_plan() -> str:
     """Get a maintenance plan showing what VMs will be affected and the instructions."""
-    return maintenance.get_maintenance_plan()
+    return await run_blocking(maintenance.get_maintenance_plan)
 
 @mcp.tool()
-def execute_power_down_sequence() -> str:
+async def execute_power_down_sequence() -> str:
     """Execute the power-down sequence based on maintenance instructions."""
-    return maintenance.execute_power_down_sequence()
+    return await run_blocking(maintenance.execute_power_down_sequence)
 
 @mcp.tool()
-def execute_power_up_sequence() -> str:
+async def execute_power_up_sequence() -> str:
     """Execute the power-up sequence based on maintenance instructions."""
-    return maintenance.execute_power_up_sequence()
+    return await run_blocking(maintenance.execute_power_up_sequence)
 
 if __name__ == "__main__":
-    import os
+    setup_logging()
+    
+    # Connect to vCenter while the transport starts up rather than on the first tool call
+    connection.warm_up()
     
     # Get transport mode from environment variable, default to stdio
     transport_mode = (os.getenv('MCP_TRANSPORT') or 'stdio').lower()
@@ -147,16 +201,16 @@ if __name__ == "__main__":
         # SSE mode for web clients like n8n
         host = os.getenv('MCP_HOST', '127.0.0.1')
         port = int(os.getenv('MCP_PORT', '8000'))
-        print(f"Starting VMware MCP Server in SSE mode on {host}:{port}")
+        logger.info("Starting VMware MCP Server in SSE mode on %s:%d", host, port)
         mcp.run(transport="sse", host=host, port=port)
     elif transport_mode == 'http':
         # HTTP mode for web deployments
         host = os.getenv('MCP_HOST', '127.0.0.1')
         port = int(os.getenv('MCP_PORT', '8000'))
         path = os.getenv('MCP_PATH') or '/mcp'
-        print(f"Starting VMware MCP Server in HTTP mode on {host}:{port}{path}")
+        logger.info("Starting VMware MCP Server in HTTP mode on %s:%d%s", host, port, path)
         mcp.run(transport="http", host=host, port=port, path=path)
     else:
         # STDIO mode (default) for local tools like Goose
-        print("Starting VMware MCP Server in STDIO mode")
-        mcp.run()
\ No newline at end of file
+        logger.info("Starting VMware MCP Server in STDIO mode")
+        mcp.run()
@@ -4,79 +4,84 @@ VM Creation Module for VMware MCP Server
 Handles VM creation from templates with customization
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pyVmomi import vim
 import connection
+import vm_info
+
+# The default resource pool rarely changes, so its lookup is reused for this
+# many seconds
+INVENTORY_TTL = 60.0
+
+# Cached lookups as key -> (expires_at, service_instance, value)
+_inventory_cache = {}
+
+
+def _cached_inventory(service_instance, key, fetch):
+    """Return a cached inventory lookup, calling fetch() when expired or from another session.
+    
+    A None result (nothing found) is not cached.
+    """
+    entry = _inventory_cache.get(key)
+    if entry and time.monotonic() < entry[0] and entry[1] is service_instance:
+        return entry[2]
+    
+    value = fetch()
+    if value is not None:
+        _inventory_cache[key] = (time.monotonic() + INVENTORY_TTL, service_instance, value)
+    return value
 
 
 def find_template(service_instance, template_name):
     """Find template by name."""
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
+        # The name index re-checks a cached hit, so a deleted template is not
+        # returned; config.template confirms it has not been converted to a VM
+        template, props = connection.find_with_properties(vim.VirtualMachine, template_name, ['config.template'])
+        if not template:
+            return None
+        if props.get('config.template'):
+            return template
         
-        for vm in container.view:
-            if vm.config.template and vm.name == template_name:
-                return vm
+        # The index keeps one object per name, and a VM in another folder can
+        # share the template's name; look for the template among all of them
+        vms = connection.retrieve_properties(vim.VirtualMachine, ['name', 'config.template'])
+        return next((vm['obj'] for vm in vms if vm.get('config.template') and vm.get('name') == template_name), None)
         
-        return None
-        
-    except Exception as e:
+    except Exception:
         return None
 
 
 def find_datastore(service_instance, datastore_name):
     """Find datastore by name."""
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.Datastore], True
-        )
-        
-        for ds in container.view:
-            if ds.name == datastore_name:
-                return ds
+        return connection.find_by_name(vim.Datastore, datastore_name)
         
-        return None
-        
-    except Exception as e:
+    except Exception:
         return None
 
 
 def find_network(service_instance, network_name):
     """Find network by name."""
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.dvs.DistributedVirtualPortgroup, vim.Network], True
-        )
-        
-        for net in container.view:
-            if net.name == network_name:
-                return net
-        
-        return None
+        # Distributed port groups are a subtype of Network, so one lookup covers both
+        return connection.find_by_name(vim.Network, network_name)
         
-    except Exception as e:
+    except Exception:
         return None
 
 
 def find_resource_pool(service_instance):
     """Find the default resource pool."""
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.ClusterComputeResource], True
-        )
+        def fetch():
+            clusters = connection.retrieve_properties(vim.ClusterComputeResource, ['resourcePool'])
+            return next((c['resourcePool'] for c in clusters if c.get('resourcePool')), None)
         
-        for cluster in container.view:
-            if cluster.resourcePool:
-                return cluster.resourcePool
+        return _cached_inventory(service_instance, 'resource_pool', fetch)
         
-        return None
-        
-    except Exception as e:
+    except Exception:
         return None
 
 
@@ -182,11 +187,16 @@ def create_vm_custom(template_name: str, new_vm_name: str, ip_address: str = "19
         return "Error: Could not connect to vCenter"
     
     try:
-        # Find all required resources
-        template = find_template(service_instance, template_name)
-        datastore = find_datastore(service_instance, datastore_name)
-        network = find_network(service_instance, network_name)
-        resource_pool = find_resource_pool(service_instance)
+        # Find all required resources; the lookups are independent, so a
+        # cold cache costs one round-trip of wall time instead of four
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            lookups = [
+                executor.submit(find_template, service_instance, template_name),
+                executor.submit(find_datastore, service_instance, datastore_name),
+                executor.submit(find_network, service_instance, network_name),
+                executor.submit(find_resource_pool, service_instance)
+            ]
+        template, datastore, network, resource_pool = [lookup.result() for lookup in lookups]
         
         # Validate resources
         validation_error = validate_resources(template, datastore, network, resource_pool, 
@@ -231,11 +241,10 @@ def create_vm_custom(template_name: str, new_vm_name: str, ip_address: str = "19
         task = template.Clone(folder=template.parent, name=new_vm_name, spec=clone_spec)
         
         # Wait for task to complete
-        while task.info.state not in [vim.TaskInfo.State.success, vim.TaskInfo.State.error]:
-            pass
+        state = connection.wait_for_task(task)
         
-        if task.info.state == vim.TaskInfo.State.success:
-            new_vm = task.info.result
+        if state == vim.TaskInfo.State.success:
+            vm_info.invalidate_vm_list_cache()
             result = f"✅ Successfully created VM '{new_vm_name}' (powered off)"
             result += f"\n- Template: {template_name}"
             result += f"\n- Memory: {memory_gb} GB"
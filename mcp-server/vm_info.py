@@ -4,41 +4,78 @@ VM Information Module for VMware MCP Server
 Handles VM listing and detailed information retrieval
 """
 
-import os
-import requests
+import time
+import threading
 from pyVmomi import vim
 import connection
 
+# How long a REST VM listing is reused before vCenter is asked again
+VM_LIST_TTL = 5.0
+
+# Cached REST VM listing as (expires_at, vms), or None when nothing is cached
+_vm_list_cache = None
+
+# Bumped on every invalidation so a fetch that was already in flight is not cached
+_vm_list_generation = 0
+
+# Held while refreshing so concurrent callers share a single vCenter request
+_vm_list_lock = threading.Lock()
+
+
+def invalidate_vm_list_cache():
+    """Drop the cached VM listing, e.g. after a power state change."""
+    global _vm_list_cache, _vm_list_generation
+    _vm_list_generation += 1
+    _vm_list_cache = None
+
+
+def _get_vm_summaries() -> list:
+    """Return the REST VM summaries, reusing a listing fetched within the last VM_LIST_TTL seconds."""
+    global _vm_list_cache
+    
+    cached = _vm_list_cache
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+    
+    with _vm_list_lock:
+        # Another caller may have refreshed the listing while we waited
+        cached = _vm_list_cache
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        generation = _vm_list_generation
+        response = connection.rest_get("/rest/vcenter/vm")
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to get VMs (HTTP {response.status_code})")
+        
+        vms = response.json()['value']
+        if generation == _vm_list_generation:
+            _vm_list_cache = (time.monotonic() + VM_LIST_TTL, vms)
+        return vms
+
 
 def list_vms() -> str:
-    """List all VMs using fast REST API."""
+    """List all VMs using fast REST API.
+    
+    Only the summary returned by the VM list call is used, so this costs one
+    request regardless of the number of VMs. The listing is reused for
+    VM_LIST_TTL seconds so bursts of calls do not each hit vCenter.
+    """
     session_id = connection.get_vcenter_session()
     if not session_id:
         return "Error: Could not connect to vCenter"
     
     try:
-        host = os.getenv('VCENTER_HOST')
-        headers = {'vmware-api-session-id': session_id}
+        # Get VMs on the cached session - this should be very fast
+        vms = _get_vm_summaries()
         
-        # Get VMs - this should be very fast
-        vm_url = f"https://{host}/rest/vcenter/vm"
-        response = requests.get(vm_url, headers=headers, verify=False, timeout=10)
+        if not vms:
+            return "No VMs found"
         
-        if response.status_code == 200:
-            vms = response.json()['value']
-            
-            if not vms:
-                return "No VMs found"
-            
-            result = f"Found {len(vms)} VMs:\n"
-            for vm in vms:
-                name = vm.get('name', 'Unknown')
-                power_state = vm.get('power_state', 'Unknown')
-                result += f"- {name} ({power_state})\n"
-            
-            return result
-        else:
-            return f"Error: Failed to get VMs (HTTP {response.status_code})"
+        lines = "".join(
+            f"- {vm.get('name', 'Unknown')} ({vm.get('power_state', 'Unknown')})\n" for vm in vms
+        )
+        return f"Found {len(vms)} VMs:\n{lines}"
             
     except Exception as e:
         return f"Error: {e}"
@@ -51,39 +88,39 @@ def get_vm_details(vm_name: str) -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
+        # Resolve the VM and read everything below in one round-trip; each
+        # vm.config or vm.guest access would otherwise be its own server call
+        vm, props = connection.find_with_properties(
+            vim.VirtualMachine, vm_name,
+            ['runtime.powerState', 'config', 'guest', 'datastore', 'resourcePool', 'parent']
         )
         
-        vm = None
-        for v in container.view:
-            if v.name == vm_name:
-                vm = v
-                break
-        
         if not vm:
             return f"VM '{vm_name}' not found"
         
+        config = props.get('config')
+        hardware = getattr(config, 'hardware', None)
+        guest = props.get('guest')
+        
         # Basic VM info
-        memory_mb = vm.config.hardware.memoryMB if vm.config and vm.config.hardware else 0
+        memory_mb = getattr(hardware, 'memoryMB', 0)
         memory_gb = round(memory_mb / 1024, 1) if memory_mb else 0
         
         details = {
-            'name': vm.name,
-            'power_state': vm.runtime.powerState,
-            'cpu_count': vm.config.hardware.numCPU if vm.config and vm.config.hardware else 0,
+            'name': props['name'],
+            'power_state': props.get('runtime.powerState'),
+            'cpu_count': getattr(hardware, 'numCPU', 0),
             'memory_mb': memory_mb,
             'memory_gb': memory_gb,
-            'guest_id': vm.config.guestId if vm.config else 'N/A',
-            'version': vm.config.version if vm.config else 'N/A',
-            'template': vm.config.template if vm.config else False
+            'guest_id': getattr(config, 'guestId', 'N/A'),
+            'version': getattr(config, 'version', 'N/A'),
+            'template': getattr(config, 'template', False)
         }
         
         # Get IP addresses and network info
-        if vm.guest and vm.guest.net:
+        if guest and guest.net:
             ip_addresses = []
-            for nic in vm.guest.net:
+            for nic in guest.net:
                 if nic.ipConfig and nic.ipConfig.ipAddress:
                     for ip in nic.ipConfig.ipAddress:
                         ip_info = f"{ip.ipAddress}/{ip.prefixLength}"
@@ -99,9 +136,9 @@ def get_vm_details(vm_name: str) -> str:
             details['ip_addresses'] = 'Network info not available'
         
         # Get network adapters
-        if vm.config and vm.config.hardware and vm.config.hardware.device:
+        if hardware and hardware.device:
             network_adapters = []
-            for device in vm.config.hardware.device:
+            for device in hardware.device:
                 if isinstance(device, vim.vm.device.VirtualEthernetCard):
                     adapter_info = f"{device.deviceInfo.label}"
                     if hasattr(device, 'backing') and device.backing:
@@ -119,29 +156,28 @@ def get_vm_details(vm_name: str) -> str:
             details['network_adapters'] = 'Network adapters not available'
         
         # Get datastore info
-        if vm.datastore:
-            datastores = [ds.name for ds in vm.datastore]
-            details['datastores'] = ', '.join(datastores)
+        datastores = props.get('datastore')
+        if datastores:
+            details['datastores'] = ', '.join(ds.name for ds in datastores)
         else:
             details['datastores'] = 'No datastores found'
         
         # Get resource pool info
-        if vm.resourcePool:
-            details['resource_pool'] = vm.resourcePool.name
+        resource_pool = props.get('resourcePool')
+        if resource_pool:
+            details['resource_pool'] = resource_pool.name
         else:
             details['resource_pool'] = 'No resource pool found'
         
         # Get folder location
-        if vm.parent:
-            details['folder'] = vm.parent.name
+        parent = props.get('parent')
+        if parent:
+            details['folder'] = parent.name
         else:
             details['folder'] = 'No folder found'
         
         # Get VMware Tools status
-        if vm.guest:
-            details['vmware_tools'] = vm.guest.toolsRunningStatus
-        else:
-            details['vmware_tools'] = 'Unknown'
+        details['vmware_tools'] = getattr(guest, 'toolsRunningStatus', 'Unknown')
         
         # Format the result
         result = f"VM Details for '{vm_name}':\n"
@@ -170,21 +206,13 @@ def list_templates() -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-        
-        templates = []
-        for vm in container.view:
-            if vm.config.template:
-                templates.append(vm.name)
+        # One round-trip for all VMs instead of reading config.template per VM
+        vms = connection.retrieve_properties(vim.VirtualMachine, ['name', 'config.template'])
+        templates = [vm['name'] for vm in vms if vm.get('config.template')]
         
         if templates:
-            result = f"Found {len(templates)} templates:\n"
-            for template in templates:
-                result += f"- {template}\n"
-            return result
+            lines = "".join(f"- {template}\n" for template in templates)
+            return f"Found {len(templates)} templates:\n{lines}"
         else:
             return "No templates found"
             
@@ -199,25 +227,21 @@ def list_datastores() -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.Datastore], True
-        )
-        
         datastores = []
-        for ds in container.view:
+        for ds in connection.retrieve_properties(vim.Datastore, ['summary']):
+            summary = ds['summary']
             datastores.append({
-                'name': ds.name,
-                'type': ds.summary.type,
-                'capacity_gb': round(ds.summary.capacity / (1024**3), 1),
-                'free_gb': round(ds.summary.freeSpace / (1024**3), 1)
+                'name': summary.name,
+                'type': summary.type,
+                'capacity_gb': round(summary.capacity / (1024**3), 1),
+                'free_gb': round(summary.freeSpace / (1024**3), 1)
             })
         
         if datastores:
-            result = f"Found {len(datastores)} datastores:\n"
-            for ds in datastores:
-                result += f"- {ds['name']} ({ds['type']}, {ds['free_gb']}GB free of {ds['capacity_gb']}GB)\n"
-            return result
+            lines = "".join(
+                f"- {ds['name']} ({ds['type']}, {ds['free_gb']}GB free of {ds['capacity_gb']}GB)\n" for ds in datastores
+            )
+            return f"Found {len(datastores)} datastores:\n{lines}"
         else:
             return "No datastores found"
             
@@ -232,7 +256,7 @@ def list_networks() -> str:
         return "Error: Could not connect to vCenter"
     
     try:
-        content = service_instance.RetrieveContent()
+        content = connection.get_content()
         container = content.viewManager.CreateContainerView(
             content.rootFolder, [vim.dvs.DistributedVirtualPortgroup, vim.Network], True
         )
@@ -253,10 +277,10 @@ def list_networks() -> str:
                 })
         
         if networks:
-            result = f"Found {len(networks)} networks:\n"
-            for net in networks:
-                result += f"- {net['name']} ({net['type']}, vSwitch: {net['vswitch']})\n"
-            return result
+            lines = "".join(
+                f"- {net['name']} ({net['type']}, vSwitch: {net['vswitch']})\n" for net in networks
+            )
+            return f"Found {len(networks)} networks:\n{lines}"
         else:
             return "No networks found"
             
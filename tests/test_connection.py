@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server Connection Management
+Tests REST session reuse and re-authentication
+"""
+
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+import connection
+from pyVmomi import vim
+
+VCENTER_ENV = {
+    'VCENTER_HOST': 'vcenter.example.com',
+    'VCENTER_USER': 'admin',
+    'VCENTER_PASSWORD': 'secret'
+}
+
+
+def make_response(status_code, payload=None):
+    """Build a fake requests response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+class TestRestSession(unittest.TestCase):
+
+    def setUp(self):
+        """Start every test with no cached REST session."""
+        self.http_session = MagicMock()
+        self.http_session.headers = {}
+        connection._http_session = self.http_session
+        connection._rest_session_id = None
+        self.env = patch.dict(os.environ, VCENTER_ENV)
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        connection._http_session = None
+        connection._rest_session_id = None
+
+    def test_session_is_reused(self):
+        """Test that repeated calls log in only once."""
+        self.http_session.post.return_value = make_response(200, {'value': 'session-1'})
+
+        self.assertEqual(connection.get_vcenter_session(), 'session-1')
+        self.assertEqual(connection.get_vcenter_session(), 'session-1')
+
+        self.assertEqual(self.http_session.post.call_count, 1)
+        self.assertEqual(self.http_session.headers['vmware-api-session-id'], 'session-1')
+
+    def test_rest_get_reauthenticates_on_401(self):
+        """Test that an expired session is replaced and the request retried."""
+        self.http_session.post.side_effect = [
+            make_response(200, {'value': 'session-1'}),
+            make_response(200, {'value': 'session-2'})
+        ]
+        self.http_session.get.side_effect = [
+            make_response(401),
+            make_response(200, {'value': []})
+        ]
+
+        response = connection.rest_get('/rest/vcenter/vm')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.http_session.post.call_count, 2)
+        self.assertEqual(self.http_session.get.call_count, 2)
+        self.assertEqual(connection._rest_session_id, 'session-2')
+
+    def test_missing_credentials(self):
+        """Test that no login is attempted without credentials."""
+        with patch.dict(os.environ, {'VCENTER_HOST': ''}):
+            with self.assertLogs(connection.logger, level='WARNING') as logs:
+                self.assertIsNone(connection.get_vcenter_session())
+                self.assertIsNone(connection.rest_get('/rest/vcenter/vm'))
+        self.assertIn('VCENTER_HOST is not set', logs.output[0])
+        self.http_session.post.assert_not_called()
+
+    def test_logout_clears_session(self):
+        """Test that logging out releases the cached session."""
+        self.http_session.post.return_value = make_response(200, {'value': 'session-1'})
+        connection.get_vcenter_session()
+
+        connection.logout_vcenter_session()
+
+        self.http_session.delete.assert_called_once()
+        self.assertIsNone(connection._rest_session_id)
+        self.assertNotIn('vmware-api-session-id', self.http_session.headers)
+
+class TestServiceInstance(unittest.TestCase):
+
+    def setUp(self):
+        """Start every test with a connected service instance that was just checked."""
+        self.service_instance = MagicMock()
+        connection._service_instance = self.service_instance
+        connection._last_liveness_check = 100.0
+
+    def tearDown(self):
+        connection._service_instance = None
+        connection._last_liveness_check = 0.0
+
+    def test_liveness_check_is_skipped_within_interval(self):
+        """Test that a recently checked connection is reused without a server call."""
+        with patch('connection.time.monotonic', return_value=100.0 + connection.LIVENESS_CHECK_INTERVAL - 1):
+            self.assertIs(connection.get_service_instance(), self.service_instance)
+        self.service_instance.CurrentTime.assert_not_called()
+
+    def test_dead_connection_is_replaced(self):
+        """Test that a failed liveness check reconnects."""
+        self.service_instance.CurrentTime.side_effect = Exception("Session expired")
+        new_instance = MagicMock()
+
+        with patch.dict(os.environ, VCENTER_ENV), \
+             patch('connection.time.monotonic', return_value=100.0 + connection.LIVENESS_CHECK_INTERVAL + 1), \
+             patch('connection.SmartConnect', return_value=new_instance) as mock_connect:
+            self.assertIs(connection.get_service_instance(), new_instance)
+
+        mock_connect.assert_called_once()
+
+    def test_content_is_retrieved_once_per_connection(self):
+        """Test that ServiceContent is cached until the service instance changes."""
+        self.assertIs(connection.get_content(), connection.get_content())
+        self.service_instance.RetrieveContent.assert_called_once()
+
+        connection._service_instance = MagicMock()
+        connection.get_content()
+        connection._service_instance.RetrieveContent.assert_called_once()
+
+    def test_warm_up_connects_in_background(self):
+        """Test that the warm-up connects once and later callers reuse that connection."""
+        connection._service_instance = None
+        new_instance = MagicMock()
+
+        with patch.dict(os.environ, VCENTER_ENV), \
+             patch('connection.SmartConnect', return_value=new_instance) as mock_connect, \
+             patch('connection.get_vcenter_session') as mock_session:
+            connection.warm_up().join(5)
+            self.assertIs(connection.get_service_instance(), new_instance)
+
+        mock_connect.assert_called_once()
+        mock_session.assert_called_once()
+        new_instance.CurrentTime.assert_not_called()
+
+class TestWaitForTask(unittest.TestCase):
+
+    def setUp(self):
+        """Install a fake service instance with a mocked property collector."""
+        self.collector = MagicMock()
+        service_instance = MagicMock()
+        service_instance.RetrieveContent.return_value.propertyCollector.CreatePropertyCollector.return_value = self.collector
+        connection._service_instance = service_instance
+
+    def tearDown(self):
+        connection._service_instance = None
+
+    def make_update(self, version, state):
+        """Build a property collector update reporting a task state."""
+        change = MagicMock()
+        change.name = 'info.state'
+        change.val = state
+        object_set = MagicMock(changeSet=[change])
+        return MagicMock(version=version, filterSet=[MagicMock(objectSet=[object_set])])
+
+    def test_waits_for_final_state(self):
+        """Test that updates are consumed until the task finishes."""
+        self.collector.WaitForUpdatesEx.side_effect = [
+            self.make_update('1', vim.TaskInfo.State.running),
+            None,
+            self.make_update('2', vim.TaskInfo.State.success)
+        ]
+
+        state = connection.wait_for_task(vim.Task('task-1'))
+
+        self.assertEqual(state, vim.TaskInfo.State.success)
+        versions = [call.args[0] for call in self.collector.WaitForUpdatesEx.call_args_list]
+        self.assertEqual(versions, ['', '1', '1'])
+        self.collector.CreateFilter.return_value.Destroy.assert_called_once()
+        self.collector.Destroy.assert_called_once()
+
+    def test_cleans_up_on_error(self):
+        """Test that the filter and collector are destroyed if waiting fails."""
+        self.collector.WaitForUpdatesEx.side_effect = Exception("Connection lost")
+
+        with self.assertRaises(Exception):
+            connection.wait_for_task(vim.Task('task-1'))
+
+        self.collector.CreateFilter.return_value.Destroy.assert_called_once()
+        self.collector.Destroy.assert_called_once()
+
+class TestRetrieveProperties(unittest.TestCase):
+
+    def setUp(self):
+        """Install a fake service instance whose property collector returns paged results."""
+        service_instance = MagicMock()
+        content = service_instance.RetrieveContent.return_value
+        content.viewManager.CreateContainerView.return_value = vim.view.ContainerView('view-1')
+        self.collector = content.propertyCollector
+        connection._service_instance = service_instance
+        connection._name_index.clear()
+        self.destroy = patch.object(vim.view.ContainerView, 'Destroy')
+        self.mock_destroy = self.destroy.start()
+
+    def tearDown(self):
+        self.destroy.stop()
+        connection._service_instance = None
+        connection._name_index.clear()
+
+    def make_object(self, obj, **props):
+        """Build an ObjectContent-like result for one managed object."""
+        prop_set = []
+        for name, val in props.items():
+            prop = MagicMock(val=val)
+            prop.name = name.replace('__', '.')
+            prop_set.append(prop)
+        return MagicMock(obj=obj, propSet=prop_set)
+
+    def test_collects_all_pages(self):
+        """Test that continuation pages are followed and the view is destroyed."""
+        self.collector.RetrievePropertiesEx.return_value = MagicMock(
+            objects=[self.make_object('vm-1', name='web-01', config__template=False)],
+            token='page-2'
+        )
+        self.collector.ContinueRetrievePropertiesEx.return_value = MagicMock(
+            objects=[self.make_object('vm-2', name='tmpl-ubuntu')],
+            token=None
+        )
+
+        objects = connection.retrieve_properties(vim.VirtualMachine, ['name', 'config.template'])
+
+        self.assertEqual(objects, [
+            {'name': 'web-01', 'config.template': False, 'obj': 'vm-1'},
+            {'name': 'tmpl-ubuntu', 'obj': 'vm-2'}
+        ])
+        self.collector.ContinueRetrievePropertiesEx.assert_called_once_with('page-2')
+        self.mock_destroy.assert_called_once()
+
+    def test_find_by_name(self):
+        """Test that objects are looked up by name from a single property fetch."""
+        self.collector.RetrievePropertiesEx.return_value = MagicMock(
+            objects=[self.make_object('vm-1', name='web-01'), self.make_object('vm-2', name='db-01')],
+            token=None
+        )
+
+        self.assertEqual(connection.find_by_name(vim.VirtualMachine, 'db-01'), 'vm-2')
+        self.assertIsNone(connection.find_by_name(vim.VirtualMachine, 'missing'))
+
+    def fetched_paths(self):
+        """Return the property paths requested by each RetrievePropertiesEx call."""
+        return [call.args[0][0].propSet[0].pathSet for call in self.collector.RetrievePropertiesEx.call_args_list]
+
+    def test_find_by_name_reuses_index(self):
+        """Test that a cached hit is confirmed with one property read instead of listing again."""
+        vm = vim.VirtualMachine('vm-1')
+        self.collector.RetrievePropertiesEx.side_effect = [
+            MagicMock(objects=[self.make_object(vm, name='db-01')], token=None),
+            MagicMock(objects=[self.make_object(vm, name='db-01', runtime__powerState='poweredOn')], token=None),
+            MagicMock(objects=[self.make_object(vm, name='db-01', runtime__powerState='poweredOff')], token=None)
+        ]
+
+        first = connection.find_with_properties(vim.VirtualMachine, 'db-01', ['runtime.powerState'])
+        second = connection.find_with_properties(vim.VirtualMachine, 'db-01', ['runtime.powerState'])
+
+        self.assertEqual(first, (vm, {'name': 'db-01', 'runtime.powerState': 'poweredOn'}))
+        self.assertEqual(second, (vm, {'name': 'db-01', 'runtime.powerState': 'poweredOff'}))
+        # The inventory is listed by name only, once; the extra paths are read for the one VM
+        self.assertEqual(self.fetched_paths(), [
+            ['name'],
+            ['name', 'runtime.powerState'],
+            ['name', 'runtime.powerState']
+        ])
+        self.mock_destroy.assert_called_once()
+
+    def test_find_by_name_rebuilds_after_rename(self):
+        """Test that a renamed object is not returned for its old name."""
+        vm = vim.VirtualMachine('vm-1')
+        self.collector.RetrievePropertiesEx.side_effect = [
+            MagicMock(objects=[self.make_object(vm, name='db-01')], token=None),
+            MagicMock(objects=[self.make_object(vm, name='db-archive', config='config')], token=None),
+            MagicMock(objects=[self.make_object(vm, name='db-archive')], token=None)
+        ]
+        connection.find_by_name(vim.VirtualMachine, 'db-01')
+
+        self.assertEqual(connection.find_with_properties(vim.VirtualMachine, 'db-01', ['config']), (None, {}))
+        # The miss rebuilds the index from names only, not from every VM's config
+        self.assertEqual(self.fetched_paths(), [['name'], ['name', 'config'], ['name']])
+        self.assertEqual(self.mock_destroy.call_count, 2)
+
+    def test_concurrent_misses_share_one_rebuild(self):
+        """Test that threads missing a cold index together list the inventory once."""
+        entered = threading.Semaphore(0)
+        release = threading.Event()
+        rebuild = connection._rebuild_name_index
+        vms = {name: vim.VirtualMachine(f'vm-{i}') for i, name in enumerate(['web-01', 'web-02', 'db-01'])}
+
+        def counting_rebuild(obj_type, stale):
+            entered.release()
+            return rebuild(obj_type, stale)
+
+        def slow_listing(obj_type, path_set):
+            release.wait(5)
+            return [{'name': name, 'obj': vm} for name, vm in vms.items()]
+
+        names = ['web-01', 'web-02', 'db-01', 'missing']
+        with patch('connection._rebuild_name_index', side_effect=counting_rebuild), \
+             patch('connection.retrieve_properties', side_effect=slow_listing) as mock_retrieve:
+            with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                futures = [executor.submit(connection.find_by_name, vim.VirtualMachine, name) for name in names]
+                # Every thread has missed the cold index before the listing returns
+                for _ in names:
+                    self.assertTrue(entered.acquire(timeout=5))
+                release.set()
+                results = [future.result() for future in futures]
+
+        self.assertEqual(results, [vms['web-01'], vms['web-02'], vms['db-01'], None])
+        mock_retrieve.assert_called_once_with(vim.VirtualMachine, ['name'])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -245,6 +245,34 @@ IP: 192.168.1.40
             app_calls = [call for call in mock_power_on.call_args_list if 'app-server' in str(call) or 'db-server' in str(call)]
             self.assertEqual(len(app_calls), 2)
 
+    def test_execute_sequence_waits_for_each_wave(self):
+        """Test that a wave finishes before the next starts and results keep VM order."""
+        with patch('maintenance.find_vms_by_category') as mock_find, \
+             patch('maintenance.power.power_off_vm') as mock_power_off:
+
+            mock_find.return_value = {
+                'categories': {
+                    'wave_1_-_worker_nodes': ['k8s-worker-01', 'k8s-worker-02', 'k8s-worker-03'],
+                    'wave_2_-_control_plane': ['k8s-master-01']
+                },
+                'all_vms': ['k8s-worker-01', 'k8s-worker-02', 'k8s-worker-03', 'k8s-master-01'],
+                'parsed_instructions': {
+                    'power_down_sequence': [
+                        '1. **Wave 1 - Worker Nodes**',
+                        '2. **Wave 2 - Control Plane**'
+                    ]
+                }
+            }
+            mock_power_off.side_effect = lambda vm_name: f"{vm_name} off"
+
+            result = maintenance.execute_power_down_sequence()
+
+            called = [call.args[0] for call in mock_power_off.call_args_list]
+            self.assertEqual(set(called[:3]), {'k8s-worker-01', 'k8s-worker-02', 'k8s-worker-03'})
+            self.assertEqual(called[3], 'k8s-master-01')
+            self.assertLess(result.index('k8s-worker-01: k8s-worker-01 off'), result.index('k8s-worker-02: k8s-worker-02 off'))
+            self.assertLess(result.index('k8s-worker-03: k8s-worker-03 off'), result.index('k8s-master-01: k8s-master-01 off'))
+
     def test_get_maintenance_plan(self):
         """Test maintenance plan generation."""
         with patch('maintenance.find_vms_by_category') as mock_find:
@@ -283,6 +311,19 @@ IP: 192.168.1.40
             self.assertIn('error', result)
             self.assertIn('Connection failed', result['error'])
 
+    def test_read_maintenance_instructions_cached(self):
+        """Test that the instructions file is only re-read when it changes."""
+        maintenance._read_instructions_file.cache_clear()
+        
+        first = maintenance.read_maintenance_instructions()
+        second = maintenance.read_maintenance_instructions()
+        
+        self.assertFalse(first.startswith('Error:'))
+        self.assertEqual(first, second)
+        cache_info = maintenance._read_instructions_file.cache_info()
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 1)
+
     def test_edge_cases(self):
         """Test edge cases and boundary conditions."""
         # Test with no VMs
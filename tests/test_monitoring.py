@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server Monitoring
+Tests VM summary statistics
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+import monitoring
+from pyVmomi import vim
+
+
+class TestVmSummaryStats(unittest.TestCase):
+
+    def test_stats_come_from_one_property_fetch(self):
+        """Test that summary stats, templates included, are computed from one paged property fetch."""
+        state = vim.VirtualMachinePowerState
+        vms = [
+            {'runtime.powerState': state.poweredOn, 'config.hardware.numCPU': 2, 'config.hardware.memoryMB': 4096},
+            {'runtime.powerState': state.poweredOff, 'config.hardware.numCPU': 4, 'config.hardware.memoryMB': 8192},
+            {'runtime.powerState': state.suspended},
+            # A template: powered off, counted like any other VM
+            {'runtime.powerState': state.poweredOff, 'config.hardware.numCPU': 1, 'config.hardware.memoryMB': 1024}
+        ]
+        with patch('monitoring.connection.get_service_instance', return_value=MagicMock()), \
+             patch('monitoring.connection.retrieve_properties', return_value=vms) as mock_retrieve:
+            result = monitoring.get_vm_summary_stats()
+
+        self.assertIn("Total VMs: 4", result)
+        self.assertIn("Powered On: 1", result)
+        self.assertIn("Powered Off: 2", result)
+        self.assertIn("Suspended: 1", result)
+        self.assertIn("Total CPU Cores: 7", result)
+        self.assertIn("Total Memory: 13 GB", result)
+        mock_retrieve.assert_called_once_with(
+            vim.VirtualMachine,
+            ['runtime.powerState', 'config.hardware.numCPU', 'config.hardware.memoryMB']
+        )
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server Power Management
+Tests the shared power on/off flow
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+import power
+from pyVmomi import vim
+
+
+class TestPowerOperations(unittest.TestCase):
+
+    def setUp(self):
+        """Pretend to be connected to vCenter."""
+        self.connected = patch('power.connection.get_service_instance', return_value=MagicMock())
+        self.connected.start()
+
+    def tearDown(self):
+        self.connected.stop()
+
+    def test_power_on_calls_power_on_and_invalidates_listing(self):
+        """Test that a powered-off VM is started and the cached listing dropped."""
+        vm = MagicMock()
+        props = {'name': 'web-01', 'runtime.powerState': vim.VirtualMachinePowerState.poweredOff}
+
+        with patch('power.connection.find_with_properties', return_value=(vm, props)), \
+             patch('power.connection.wait_for_task', return_value=vim.TaskInfo.State.success), \
+             patch('power.vm_info.invalidate_vm_list_cache') as mock_invalidate:
+            result = power.power_on_vm('web-01')
+
+        self.assertEqual(result, "✅ Successfully powered on VM 'web-01'")
+        vm.PowerOn.assert_called_once()
+        vm.PowerOff.assert_not_called()
+        mock_invalidate.assert_called_once()
+
+    def test_power_off_skips_vm_already_off(self):
+        """Test that no task is started for a VM already in the target state."""
+        vm = MagicMock()
+        props = {'name': 'web-01', 'runtime.powerState': vim.VirtualMachinePowerState.poweredOff}
+
+        with patch('power.connection.find_with_properties', return_value=(vm, props)):
+            result = power.power_off_vm('web-01')
+
+        self.assertEqual(result, "VM 'web-01' is already powered off")
+        vm.PowerOff.assert_not_called()
+
+    def test_missing_vm(self):
+        """Test that an unknown VM name is reported."""
+        with patch('power.connection.find_with_properties', return_value=(None, {})):
+            self.assertEqual(power.power_on_vm('missing'), "VM 'missing' not found")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
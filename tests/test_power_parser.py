@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server Power Parser
+Tests memoized parsing of maintenance instructions
+"""
+
+import sys
+import os
+import unittest
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+from helpers import power_parser
+
+INSTRUCTIONS = """
+## VM Power-Down Sequence
+We will power off the VMs in this order:
+
+1. **Wave 1 - Worker Nodes**
+   - workers or node
+
+2. **Wave 2 - Control Plane**
+   - master or control-plane
+"""
+
+
+class TestSmartParser(unittest.TestCase):
+
+    def setUp(self):
+        power_parser._parse_power_instructions_smart_cached.cache_clear()
+
+    def test_repeated_parses_are_cached(self):
+        """Test that the same instructions text is only parsed once."""
+        first = power_parser.parse_power_instructions_smart(INSTRUCTIONS)
+        second = power_parser.parse_power_instructions_smart(INSTRUCTIONS)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first['power_down_sequence'][0]['category'], 'worker_nodes')
+        self.assertEqual(power_parser._parse_power_instructions_smart_cached.cache_info().hits, 1)
+
+    def test_callers_cannot_change_the_cached_result(self):
+        """Test that mutating a returned result does not leak into later calls."""
+        first = power_parser.parse_power_instructions_smart(INSTRUCTIONS)
+        first['power_down_sequence'].clear()
+        first['categories']['worker_nodes'].append('extra')
+
+        second = power_parser.parse_power_instructions_smart(INSTRUCTIONS)
+
+        self.assertTrue(second['power_down_sequence'])
+        self.assertNotIn('extra', second['categories']['worker_nodes'])
+
+class TestCategorizeVms(unittest.TestCase):
+
+    def test_vms_are_assigned_to_the_first_matching_category(self):
+        """Test selector matching, singular forms and the remaining catch-all."""
+        parsed = {'categories': {
+            'worker_nodes': ['workers', 'node'],
+            'control_plane': ['master', 'control-plane'],
+            'remaining': ['remaining']
+        }}
+        vms = ['k8s-worker-01', 'k8s-MASTER-01', 'k8s-node-02', 'db-01']
+
+        categorized = power_parser.categorize_vms_by_power(vms, parsed)
+
+        self.assertEqual(categorized, {
+            'worker_nodes': ['k8s-worker-01', 'k8s-node-02'],
+            'control_plane': ['k8s-MASTER-01'],
+            'remaining': ['db-01']
+        })
+
+    def test_singular_name_matching_is_optional(self):
+        """Test that the singular VM name only matches when requested."""
+        self.assertTrue(power_parser.build_selector_matcher(['node-pool'])('nodes'))
+        self.assertFalse(power_parser.build_selector_matcher(['node-pool'], match_singular_name=False)('nodes'))
+        self.assertTrue(power_parser.build_selector_matcher(['worker'], match_singular_name=False)('k8s-WORKER-01'))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
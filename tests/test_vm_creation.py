@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server VM Creation
+Tests the inventory lookups used when cloning templates
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+import vm_creation
+from pyVmomi import vim
+
+
+class TestFindTemplate(unittest.TestCase):
+
+    def test_template_is_resolved_through_name_index(self):
+        """Test that templates are looked up with their template flag in one call."""
+        with patch('vm_creation.connection.find_with_properties',
+                   return_value=('vm-1', {'name': 'ubuntu-template', 'config.template': True})) as mock_find:
+            self.assertEqual(vm_creation.find_template(MagicMock(), 'ubuntu-template'), 'vm-1')
+
+        mock_find.assert_called_once_with(vim.VirtualMachine, 'ubuntu-template', ['config.template'])
+
+    def test_regular_vm_is_not_a_template(self):
+        """Test that a template converted back to a VM is no longer returned."""
+        vms = [{'name': 'ubuntu-template', 'config.template': False, 'obj': 'vm-1'}]
+        with patch('vm_creation.connection.find_with_properties',
+                   return_value=('vm-1', {'name': 'ubuntu-template', 'config.template': False})), \
+             patch('vm_creation.connection.retrieve_properties', return_value=vms):
+            self.assertIsNone(vm_creation.find_template(MagicMock(), 'ubuntu-template'))
+
+    def test_template_sharing_a_name_with_a_vm(self):
+        """Test that a template is found when the name index holds a same-name VM."""
+        vms = [
+            {'name': 'ubuntu-template', 'config.template': False, 'obj': 'vm-1'},
+            {'name': 'web-01', 'config.template': True, 'obj': 'vm-2'},
+            {'name': 'ubuntu-template', 'config.template': True, 'obj': 'vm-3'}
+        ]
+        with patch('vm_creation.connection.find_with_properties',
+                   return_value=('vm-1', {'name': 'ubuntu-template', 'config.template': False})), \
+             patch('vm_creation.connection.retrieve_properties', return_value=vms) as mock_retrieve:
+            self.assertEqual(vm_creation.find_template(MagicMock(), 'ubuntu-template'), 'vm-3')
+
+        mock_retrieve.assert_called_once_with(vim.VirtualMachine, ['name', 'config.template'])
+
+    def test_missing_template(self):
+        """Test that an unknown or deleted template is not found without a second listing."""
+        with patch('vm_creation.connection.find_with_properties', return_value=(None, {})), \
+             patch('vm_creation.connection.retrieve_properties') as mock_retrieve:
+            self.assertIsNone(vm_creation.find_template(MagicMock(), 'ubuntu-template'))
+
+        mock_retrieve.assert_not_called()
+
+class TestInventoryCache(unittest.TestCase):
+
+    def setUp(self):
+        """Start every test with an empty inventory cache."""
+        vm_creation._inventory_cache.clear()
+        self.service_instance = MagicMock()
+
+    def tearDown(self):
+        vm_creation._inventory_cache.clear()
+
+    def test_cache_is_not_shared_across_sessions(self):
+        """Test that a reconnect does not reuse objects bound to the old session."""
+        pools = [{'resourcePool': 'pool-1', 'obj': 'cluster-1'}]
+        with patch('vm_creation.connection.retrieve_properties', return_value=pools) as mock_retrieve:
+            vm_creation.find_resource_pool(self.service_instance)
+            vm_creation.find_resource_pool(self.service_instance)
+            vm_creation.find_resource_pool(MagicMock())
+
+        self.assertEqual(mock_retrieve.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
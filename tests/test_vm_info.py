@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test file for VMware MCP Server VM Information
+Tests the cached REST VM listing and VM details
+"""
+
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+# Add the mcp-server directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mcp-server'))
+
+import vm_info
+from pyVmomi import vim
+
+SAMPLE_VMS = [
+    {'name': 'k8s-worker-01', 'power_state': 'POWERED_ON'},
+    {'name': 'db-server-01', 'power_state': 'POWERED_OFF'}
+]
+
+
+def make_response(status_code, payload=None):
+    """Build a fake requests response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+class TestVmListCache(unittest.TestCase):
+
+    def setUp(self):
+        """Start every test with an empty VM listing cache and a logged-in session."""
+        vm_info.invalidate_vm_list_cache()
+        self.session = patch('vm_info.connection.get_vcenter_session', return_value='session-1')
+        self.session.start()
+
+    def tearDown(self):
+        self.session.stop()
+        vm_info.invalidate_vm_list_cache()
+
+    def test_listing_is_reused_within_ttl(self):
+        """Test that repeated calls inside the TTL make one REST request."""
+        with patch('vm_info.connection.rest_get', return_value=make_response(200, {'value': SAMPLE_VMS})) as mock_get:
+            first = vm_info.list_vms()
+            second = vm_info.list_vms()
+
+        self.assertEqual(first, second)
+        self.assertIn('- k8s-worker-01 (POWERED_ON)', first)
+        mock_get.assert_called_once_with('/rest/vcenter/vm')
+
+    def test_listing_is_refetched_after_expiry_or_invalidation(self):
+        """Test that an expired or invalidated listing goes back to vCenter."""
+        clock = [0.0]
+        with patch('vm_info.connection.rest_get', return_value=make_response(200, {'value': SAMPLE_VMS})) as mock_get, \
+             patch('vm_info.time.monotonic', side_effect=lambda: clock[0]):
+            vm_info.list_vms()
+            clock[0] = vm_info.VM_LIST_TTL + 1
+            vm_info.list_vms()
+            vm_info.invalidate_vm_list_cache()
+            vm_info.list_vms()
+
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_concurrent_callers_share_one_request(self):
+        """Test that callers arriving during a refresh wait for it instead of querying again."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(path):
+            started.set()
+            release.wait(5)
+            return make_response(200, {'value': SAMPLE_VMS})
+
+        with patch('vm_info.connection.rest_get', side_effect=slow_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                first = executor.submit(vm_info.list_vms)
+                started.wait(5)
+                others = [executor.submit(vm_info.list_vms) for _ in range(3)]
+                release.set()
+                results = [first.result()] + [future.result() for future in others]
+
+        mock_get.assert_called_once()
+        self.assertEqual(len(set(results)), 1)
+
+    def test_invalidation_during_fetch_is_not_cached(self):
+        """Test that a listing fetched across a power change is returned but not reused."""
+        def get_with_power_change(path):
+            vm_info.invalidate_vm_list_cache()
+            return make_response(200, {'value': SAMPLE_VMS})
+
+        with patch('vm_info.connection.rest_get', side_effect=get_with_power_change) as mock_get:
+            vm_info.list_vms()
+            vm_info.list_vms()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        """Test that a failed listing is reported and retried on the next call."""
+        with patch('vm_info.connection.rest_get', side_effect=[
+            make_response(503),
+            make_response(200, {'value': SAMPLE_VMS})
+        ]):
+            self.assertEqual(vm_info.list_vms(), "Error: Failed to get VMs (HTTP 503)")
+            self.assertIn('Found 2 VMs', vm_info.list_vms())
+
+class TestVmDetails(unittest.TestCase):
+
+    def test_details_come_from_one_property_fetch(self):
+        """Test that details are built from the fetched properties without reading the VM again."""
+        # A managed object with no server stub fails on any property read
+        vm = vim.VirtualMachine('vm-1')
+        config = MagicMock(guestId='ubuntu64Guest', version='vmx-19', template=False)
+        config.hardware = MagicMock(memoryMB=4096, numCPU=2, device=[])
+        props = {
+            'name': 'web-01',
+            'runtime.powerState': 'poweredOn',
+            'config': config,
+            'guest': MagicMock(net=[], toolsRunningStatus='guestToolsRunning'),
+            'resourcePool': MagicMock()
+        }
+        props['resourcePool'].name = 'Resources'
+
+        with patch('vm_info.connection.get_service_instance', return_value=MagicMock()), \
+             patch('vm_info.connection.find_with_properties', return_value=(vm, props)) as mock_find:
+            result = vm_info.get_vm_details('web-01')
+
+        mock_find.assert_called_once()
+        self.assertIn("- Memory: 4.0 GB (4096 MB)", result)
+        self.assertIn("- VMware Tools: guestToolsRunning", result)
+        self.assertIn("- Datastores: No datastores found", result)
+        self.assertIn("- Resource Pool: Resources", result)
+        self.assertIn("- Folder: No folder found", result)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)